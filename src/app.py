@@ -2,6 +2,7 @@
 Main application window for Ol-GUI.
 """
 import threading
+from concurrent.futures import Future
 from typing import Optional
 import customtkinter as ctk
 
@@ -15,19 +16,31 @@ from services.export_service import ExportService
 from services.search_service import SearchService
 from models.message import Message
 from models.conversation import Conversation
-from utils.config import get_theme_colors
+from utils.config import SELECTED_TEXT_COLOR, get_theme_colors
 
 
 class OllamaGUI(ctk.CTk):
     """Main application window for Ol-GUI."""
 
-    def __init__(self) -> None:
-        """Initialize the main application window."""
+    def __init__(
+        self,
+        ollama_service: Optional[OllamaService] = None,
+        models_future: Optional[Future] = None,
+    ) -> None:
+        """
+        Initialize the main application window.
+
+        Args:
+            ollama_service: OllamaService instance. Creates new one if not provided.
+            models_future: Optional pending list_models() result started before the
+                window was created, consumed by the first model refresh.
+        """
         super().__init__(className="OL-GUI")
 
         # Initialize services
         self.settings = SettingsManager()
-        self.ollama = OllamaService()
+        self.ollama = ollama_service or OllamaService()
+        self._models_future = models_future
         self.conv_manager = ConversationManager()
         self.export_service = ExportService()
         self.search_service = SearchService(self.conv_manager)
@@ -125,7 +138,7 @@ class OllamaGUI(ctk.CTk):
             theme_colors=theme_colors,
         )
         self.sidebar.grid(row=0, column=0, rowspan=2, sticky="nsew")
-        self.sidebar.set_refresh_models_callback(self._refresh_models)
+        self.sidebar.set_refresh_models_callback(self._on_refresh_models)
         self.sidebar.set_settings_callback(self._on_settings)
         self.sidebar.set_rename_conversation_callback(self._on_rename_conversation)
         self.sidebar.set_search_callback(self._on_search)
@@ -194,7 +207,9 @@ class OllamaGUI(ctk.CTk):
     def _refresh_models(self) -> None:
         """Refresh the list of available models."""
         try:
-            models = self.ollama.list_models()
+            # Use the startup probe once if it was started, otherwise query now
+            future, self._models_future = self._models_future, None
+            models = future.result() if future else self.ollama.list_models()
             model_names = [model.get("name", "unknown") for model in models]
 
             self.after(0, lambda: self.sidebar.update_models(
@@ -213,6 +228,11 @@ class OllamaGUI(ctk.CTk):
                 None
             ))
 
+    def _on_refresh_models(self) -> None:
+        """Handle the refresh button by bypassing the cached model list."""
+        self.ollama.invalidate_models_cache()
+        self._refresh_models()
+
     def _load_conversations(self):
         """Load conversation history into sidebar."""
         try:
@@ -278,7 +298,7 @@ class OllamaGUI(ctk.CTk):
                     if cid == conv_id:
                         btn.configure(
                             fg_color=self.sidebar.theme_colors["primary"],
-                            text_color="#e0e0e0",
+                            text_color=SELECTED_TEXT_COLOR,
                             hover_color=self.sidebar.theme_colors["primary_hover"]
                         )
                     else:
@@ -328,10 +348,7 @@ class OllamaGUI(ctk.CTk):
             # For now, just print results - could show in a dialog or highlight in chat
             print(f"Search results for '{query}': {len(results)} matches")
             for result in results[:5]:  # Show first 5
-                snippet = self.search_service.highlight_matches(
-                    result["content"], query, max_context=50
-                )
-                print(f"  - [{result['conversation_title']}] {snippet}")
+                print(f"  - [{result['conversation_title']}] {result['snippet']}")
 
         except Exception as e:
             print(f"Search failed: {e}")
@@ -618,6 +635,7 @@ Ctrl+E - Export conversation"""
 
         if self.current_model:
             self.ollama.cleanup(self.current_model)
+        self.ollama.close()
 
         self.destroy()
 
@@ -2,10 +2,10 @@
 Sidebar component for model selection and conversation history.
 """
 import customtkinter as ctk
-from typing import Callable, List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Tuple
 from pathlib import Path
 from PIL import Image
-from utils.config import get_theme_colors
+from utils.config import SELECTED_TEXT_COLOR, get_theme_colors
 
 
 class Sidebar(ctk.CTkFrame):
@@ -43,6 +43,7 @@ class Sidebar(ctk.CTkFrame):
         self.current_conversation_id: Optional[int] = None
         self.conversation_buttons: Dict[int, ctk.CTkButton] = {}
         self.conversation_options_buttons: Dict[int, ctk.CTkButton] = {}  # Store options buttons
+        self._last_models: Tuple[str, ...] = ()  # Values last passed to the model dropdown
         self.current_font_size: int = 14  # Default font size, will be updated
         self.theme_colors = theme_colors or get_theme_colors("dark")
 
@@ -198,16 +199,7 @@ class Sidebar(ctk.CTkFrame):
         self.search_entry.bind("<Return>", self._handle_search)
 
         # Scrollable frame for conversations
-        self.conversations_frame = ctk.CTkScrollableFrame(
-            self,
-            fg_color="transparent",
-            scrollbar_button_color=self.theme_colors["border"],
-            scrollbar_button_hover_color=self.theme_colors["primary"],
-        )
-        self.conversations_frame.pack(fill="both", expand=True, padx=10, pady=5)
-
-        # Bind mouse wheel scrolling for conversations frame
-        self._bind_conversations_mouse_wheel()
+        self._create_conversations_frame()
 
         # Settings button at bottom
         self.settings_btn = ctk.CTkButton(
@@ -222,6 +214,25 @@ class Sidebar(ctk.CTkFrame):
         )
         self.settings_btn.pack(side="bottom", pady=15, padx=20, fill="x")
 
+    def _create_conversations_frame(self, before=None) -> None:
+        """
+        Create and pack the scrollable frame holding the conversation list.
+
+        Args:
+            before: Optional widget to pack the frame before, preserving layout order.
+        """
+        self.conversations_frame = ctk.CTkScrollableFrame(
+            self,
+            fg_color="transparent",
+            scrollbar_button_color=self.theme_colors["border"],
+            scrollbar_button_hover_color=self.theme_colors["primary"],
+        )
+        pack_options = {"before": before} if before is not None else {}
+        self.conversations_frame.pack(fill="both", expand=True, padx=10, pady=5, **pack_options)
+
+        # Bind mouse wheel scrolling for conversations frame
+        self._bind_conversations_mouse_wheel()
+
     def _handle_model_change(self, model_name: str) -> None:
         """
         Handle model selection change.
@@ -262,15 +273,21 @@ class Sidebar(ctk.CTkFrame):
             current_model: Currently selected model (optional).
         """
         if not models:
-            self.model_dropdown.configure(values=["No models available"])
+            models = ["No models available"]
+            if tuple(models) != self._last_models:
+                self.model_dropdown.configure(values=models)
+                self._last_models = tuple(models)
             return
 
-        self.model_dropdown.configure(values=models)
+        # Reconfiguring rebuilds the dropdown menu, so skip it when unchanged
+        values = tuple(models)
+        if values != self._last_models:
+            self.model_dropdown.configure(values=models)
+            self._last_models = values
 
-        if current_model and current_model in models:
-            self.model_dropdown.set(current_model)
-        elif models:
-            self.model_dropdown.set(models[0])
+        selected = current_model if current_model in models else models[0]
+        if self.model_dropdown.get() != selected:
+            self.model_dropdown.set(selected)
 
     def add_conversation(self, conv_id: int, title: str, is_current: bool = False) -> None:
         """
@@ -298,7 +315,7 @@ class Sidebar(ctk.CTkFrame):
             text=display_title,
             command=lambda: self._handle_conversation_click(conv_id),
             font=("", conv_font_size),
-            text_color="#e0e0e0" if is_current else self.theme_colors["text"],
+            text_color=SELECTED_TEXT_COLOR if is_current else self.theme_colors["text"],
             fg_color=self.theme_colors["background"] if is_current else "transparent",
             hover_color=self.theme_colors["primary_hover"] if is_current else self.theme_colors["border"],
             anchor="w",
@@ -343,7 +360,7 @@ class Sidebar(ctk.CTkFrame):
             if cid == conv_id:
                 btn.configure(
                     fg_color=self.theme_colors["primary"],
-                    text_color="#e0e0e0",
+                    text_color=SELECTED_TEXT_COLOR,
                     hover_color=self.theme_colors["primary_hover"]
                 )
             else:
@@ -509,8 +526,15 @@ class Sidebar(ctk.CTkFrame):
 
     def clear_conversations(self) -> None:
         """Clear all conversations from the sidebar."""
-        for widget in self.conversations_frame.winfo_children():
-            widget.destroy()
+        # Replace the whole container in one operation instead of destroying rows one by one.
+        # CTkScrollableFrame.destroy() only removes the inner frame, so also destroy the
+        # packed outer frame (canvas and scrollbar) or an empty scroll area is left behind.
+        old_frame = self.conversations_frame
+        old_frame.destroy()
+        parent_frame = getattr(old_frame, "_parent_frame", None)
+        if parent_frame is not None:
+            parent_frame.destroy()
+        self._create_conversations_frame(before=self.settings_btn)
 
         self.conversation_buttons.clear()
         self.conversation_options_buttons.clear()
@@ -579,6 +603,10 @@ class Sidebar(ctk.CTkFrame):
         Args:
             theme_colors: Dictionary of theme colors from config
         """
+        # Re-applying the active theme would reconfigure every conversation row for nothing
+        if theme_colors == self.theme_colors:
+            return
+
         self.theme_colors = theme_colors
 
         # Update frame background
@@ -638,7 +666,7 @@ class Sidebar(ctk.CTkFrame):
             if is_current:
                 btn.configure(
                     fg_color=theme_colors["primary"],
-                    text_color="#e0e0e0",
+                    text_color=SELECTED_TEXT_COLOR,
                     hover_color=theme_colors["primary_hover"]
                 )
             else:
@@ -659,24 +687,12 @@ class Sidebar(ctk.CTkFrame):
         """
         Update the sidebar theme (deprecated - use update_theme_colors).
 
+        Conversation buttons are already recolored by update_theme_colors,
+        so this no longer walks the button list.
+
         Args:
             theme: Theme name ("dark", "light", or "system")
         """
-        # For backwards compatibility - just update conversation buttons
-        for conv_id, btn in self.conversation_buttons.items():
-            is_current = (conv_id == self.current_conversation_id)
-            if is_current:
-                btn.configure(
-                    fg_color=self.theme_colors["primary"],
-                    text_color="#e0e0e0",
-                    hover_color=self.theme_colors["primary_hover"]
-                )
-            else:
-                btn.configure(
-                    fg_color="transparent",
-                    text_color=self.theme_colors["text"],
-                    hover_color=self.theme_colors["border"]
-                )
 
     def update_font_size(self, font_size: int) -> None:
         """
@@ -3,6 +3,7 @@
 Ol-GUI - Main entry point for the application.
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add src to path for imports
@@ -11,12 +12,25 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 def main() -> None:
     """Main entry point for Ol-GUI."""
-    from app import OllamaGUI
+    try:
+        from services.ollama_service import OllamaService
+
+        # Start model discovery now so it overlaps with loading the GUI toolkit
+        ollama_service = OllamaService()
+        executor = ThreadPoolExecutor(max_workers=1)
+        models_future = executor.submit(ollama_service.list_models)
+        executor.shutdown(wait=False)
+
+        from app import OllamaGUI
+    except ImportError as e:
+        print(f"Missing dependency: {e}")
+        print("Install requirements with: pip install -r requirements.txt")
+        sys.exit(1)
 
     print("Ol-GUI starting...")
 
     try:
-        app = OllamaGUI()
+        app = OllamaGUI(ollama_service=ollama_service, models_future=models_future)
         app.run()
     except KeyboardInterrupt:
         print("\nShutting down...")
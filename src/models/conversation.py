@@ -3,11 +3,12 @@ Conversation data model.
 """
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Any, Mapping
 from models.message import Message
+from utils.config import DEFAULT_MODEL_PARAMETERS
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """Represents a conversation with message history."""
 
@@ -18,7 +19,9 @@ class Conversation:
     updated_at: datetime = None
     id: Optional[int] = None
     system_prompt: Optional[str] = None
-    model_parameters: Dict[str, Any] = field(default_factory=dict)
+    model_parameters: Mapping[str, Any] = field(default_factory=dict)
+    message_count: int = 0
+    last_message_preview: Optional[str] = None
 
     def __post_init__(self) -> None:
         """Set default values after initialization."""
@@ -28,14 +31,21 @@ class Conversation:
         if self.updated_at is None:
             self.updated_at = now
 
-        # Set default model parameters if not provided
+        # Share the read-only defaults until a parameter is changed
         if not self.model_parameters:
-            self.model_parameters = {
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "top_k": 40,
-                "max_tokens": 2048,
-            }
+            self.model_parameters = DEFAULT_MODEL_PARAMETERS
+
+    def set_param(self, key: str, value: Any) -> None:
+        """
+        Set a single model parameter.
+
+        Copies the parameters on write so the shared defaults are never mutated.
+
+        Args:
+            key: Parameter name (e.g. 'temperature').
+            value: Parameter value.
+        """
+        self.model_parameters = {**self.model_parameters, key: value}
 
     def add_message(self, message: Message) -> None:
         """
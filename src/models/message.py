@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Literal
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Represents a single message in a conversation."""
 
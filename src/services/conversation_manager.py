@@ -1,14 +1,55 @@
 """
 Conversation management service.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+from collections import Counter
 from datetime import datetime
-import sqlite3
+from itertools import groupby
+from operator import itemgetter
 import json
 
 from models.conversation import Conversation
 from models.message import Message
+from utils.config import DEFAULT_MODEL_PARAMETERS
 from utils.database import Database
+from utils import json_codec
+
+try:
+    # Optional C parser, several times faster than datetime.fromisoformat
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = datetime.fromisoformat
+
+# Fixed column orders so rows can be unpacked positionally
+_CONVERSATION_COLUMNS = (
+    "id, title, model, created_at, updated_at, system_prompt, model_parameters, "
+    "message_count, last_message_preview"
+)
+_MESSAGE_COLUMNS = "id, role, content, created_at"
+
+# Stored JSON for the default parameters (current and legacy spacing), which
+# maps straight to the shared defaults without parsing
+_DEFAULT_PARAMETERS_JSON = json_codec.dumps(dict(DEFAULT_MODEL_PARAMETERS))
+_DEFAULT_PARAMETERS_JSON_FORMS = frozenset({
+    _DEFAULT_PARAMETERS_JSON,
+    json.dumps(dict(DEFAULT_MODEL_PARAMETERS)),
+})
+
+
+def _fts_match(query: str) -> str:
+    """
+    Build an FTS5 match expression for a user search query.
+
+    Each word is quoted so FTS operators in user input are literal, then
+    prefix-matched.
+
+    Args:
+        query: Search query string.
+
+    Returns:
+        Match expression, or an empty string if the query has no words.
+    """
+    return " ".join('"' + token.replace('"', '""') + '"*' for token in query.split())
 
 
 class ConversationManager:
@@ -44,28 +85,28 @@ class ConversationManager:
         """
         # Use default parameters if not provided
         if model_parameters is None:
-            model_parameters = {
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "top_k": 40,
-                "max_tokens": 2048,
-            }
+            model_parameters = DEFAULT_MODEL_PARAMETERS
+            parameters_json = _DEFAULT_PARAMETERS_JSON
+        else:
+            parameters_json = json_codec.dumps(model_parameters)
 
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            cursor = conn.execute(
                 """INSERT INTO conversations
                    (title, model, system_prompt, model_parameters)
-                   VALUES (?, ?, ?, ?)""",
-                (title, model, system_prompt, json.dumps(model_parameters)),
+                   VALUES (?, ?, ?, ?)
+                   RETURNING id, created_at, updated_at""",
+                (title, model, system_prompt, parameters_json),
             )
+            conversation_id, created_at, updated_at = cursor.fetchone()
             conn.commit()
-            conversation_id = cursor.lastrowid
 
         return Conversation(
             id=conversation_id,
             title=title,
             model=model,
+            created_at=parse_datetime(created_at),
+            updated_at=parse_datetime(updated_at),
             system_prompt=system_prompt,
             model_parameters=model_parameters,
         )
@@ -81,12 +122,10 @@ class ConversationManager:
             The conversation or None if not found.
         """
         with self.db.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
             # Get conversation
-            cursor.execute(
-                "SELECT * FROM conversations WHERE id = ?", (conversation_id,)
+            cursor = conn.execute(
+                f"SELECT {_CONVERSATION_COLUMNS} FROM conversations WHERE id = ?",
+                (conversation_id,),
             )
             row = cursor.fetchone()
 
@@ -94,45 +133,107 @@ class ConversationManager:
                 return None
 
             # Get messages
-            cursor.execute(
-                "SELECT * FROM messages WHERE conversation_id = ? ORDER BY created_at",
+            cursor = conn.execute(
+                f"""SELECT {_MESSAGE_COLUMNS} FROM messages
+                    WHERE conversation_id = ? ORDER BY created_at, id""",
                 (conversation_id,),
             )
-            message_rows = cursor.fetchall()
+            messages = self._read_messages(cursor)
 
-        messages = [
-            Message(
-                id=msg["id"],
-                role=msg["role"],
-                content=msg["content"],
-                created_at=datetime.fromisoformat(msg["created_at"]),
+        return self._conversation_from_row(row, messages)
+
+    def get_conversation_messages(
+        self, conversation_id: int, limit: int = -1, offset: int = 0
+    ) -> List[Message]:
+        """
+        Get one page of a conversation's messages in chronological order.
+
+        Args:
+            conversation_id: The conversation ID.
+            limit: Maximum number of messages to return (-1 for no limit).
+            offset: Number of messages to skip.
+
+        Returns:
+            List of messages.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.execute(
+                f"""SELECT {_MESSAGE_COLUMNS} FROM messages WHERE conversation_id = ?
+                    ORDER BY created_at, id LIMIT ? OFFSET ?""",
+                (conversation_id, limit, offset),
             )
-            for msg in message_rows
-        ]
+            return self._read_messages(cursor)
+
+    @staticmethod
+    def _read_messages(cursor, batch_size: int = 256) -> List[Message]:
+        """
+        Build Message objects from an executed messages query.
+
+        Rows are fetched in batches so the full result set is never held
+        alongside the Message list.
+
+        Args:
+            cursor: Cursor with a pending SELECT over the messages table.
+            batch_size: Number of rows to fetch per batch.
+
+        Returns:
+            List of messages.
+        """
+        messages = []
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return messages
+            messages.extend(
+                Message(
+                    id=message_id,
+                    role=role,
+                    content=content,
+                    created_at=parse_datetime(created_at),
+                )
+                for message_id, role, content, created_at in rows
+            )
+
+    @staticmethod
+    def _conversation_from_row(
+        row: Tuple, messages: Optional[List[Message]] = None
+    ) -> Conversation:
+        """
+        Build a Conversation from a row selected with _CONVERSATION_COLUMNS.
+
+        Args:
+            row: Conversation row tuple.
+            messages: Optional list of messages to attach.
+
+        Returns:
+            The conversation.
+        """
+        (
+            conversation_id, title, model, created_at, updated_at,
+            system_prompt, raw_parameters, message_count, last_message_preview,
+        ) = row
 
         # Parse model parameters from JSON
-        model_parameters = {}
-        if row["model_parameters"]:
+        if not raw_parameters or raw_parameters in _DEFAULT_PARAMETERS_JSON_FORMS:
+            model_parameters = DEFAULT_MODEL_PARAMETERS
+        else:
             try:
-                model_parameters = json.loads(row["model_parameters"])
+                model_parameters = json_codec.loads(raw_parameters)
             except json.JSONDecodeError:
                 # Use defaults if JSON is invalid
-                model_parameters = {
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                    "top_k": 40,
-                    "max_tokens": 2048,
-                }
+                model_parameters = DEFAULT_MODEL_PARAMETERS
 
         return Conversation(
-            id=row["id"],
-            title=row["title"],
-            model=row["model"],
-            messages=messages,
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-            system_prompt=row["system_prompt"],
+            id=conversation_id,
+            title=title,
+            model=model,
+            messages=messages if messages is not None else [],
+            created_at=parse_datetime(created_at),
+            updated_at=parse_datetime(updated_at),
+            system_prompt=system_prompt,
             model_parameters=model_parameters,
+            message_count=message_count,
+            last_message_preview=last_message_preview,
         )
 
     def add_message(
@@ -150,72 +251,121 @@ class ConversationManager:
             The created message.
         """
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Insert message
-            cursor.execute(
-                "INSERT INTO messages (conversation_id, role, content) VALUES (?, ?, ?)",
+            cursor = conn.execute(
+                """INSERT INTO messages (conversation_id, role, content)
+                   VALUES (?, ?, ?)
+                   RETURNING id, created_at""",
                 (conversation_id, role, content),
             )
-
-            # Update conversation timestamp
-            cursor.execute(
-                "UPDATE conversations SET updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                (conversation_id,),
-            )
-
+            message_id, created_at = cursor.fetchone()
             conn.commit()
-            message_id = cursor.lastrowid
 
         return Message(
             id=message_id,
             role=role,
             content=content,
+            created_at=parse_datetime(created_at),
         )
 
+    def add_messages(
+        self, conversation_id: int, messages: Iterable[Tuple[str, str]]
+    ) -> List[Message]:
+        """
+        Add several messages to a conversation in a single transaction.
+
+        Args:
+            conversation_id: The conversation ID.
+            messages: Iterable of (role, content) pairs, in order.
+
+        Returns:
+            The created messages.
+        """
+        rows = list(messages)
+        if not rows:
+            return []
+
+        with self.db.get_connection() as conn:
+            # Insert all messages with one statement
+            conn.executemany(
+                "INSERT INTO messages (conversation_id, role, content) VALUES (?, ?, ?)",
+                ((conversation_id, role, content) for role, content in rows),
+            )
+
+            # Rowids are assigned sequentially within this write transaction,
+            # so the batch is the last len(rows) ids
+            cursor = conn.execute(
+                """SELECT id, created_at FROM messages
+                   WHERE id > last_insert_rowid() - ? ORDER BY id""",
+                (len(rows),),
+            )
+            inserted = cursor.fetchall()
+
+            # The conversation's updated_at is bumped by the messages_stats_ai trigger
+            conn.commit()
+
+        return [
+            Message(
+                id=message_id,
+                role=role,
+                content=content,
+                created_at=parse_datetime(created_at),
+            )
+            for (message_id, created_at), (role, content) in zip(inserted, rows)
+        ]
+
     def list_conversations(self) -> List[Conversation]:
         """
         List all conversations ordered by updated_at.
 
+        Message counts and previews are read from columns kept current by
+        triggers, so no per-conversation queries are needed.
+
         Returns:
             List of conversations (without messages loaded).
         """
         with self.db.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM conversations ORDER BY updated_at DESC"
+            cursor = conn.execute(
+                f"SELECT {_CONVERSATION_COLUMNS} FROM conversations ORDER BY updated_at DESC"
             )
             rows = cursor.fetchall()
 
-        conversations = []
-        for row in rows:
-            # Parse model parameters from JSON
-            model_parameters = {}
-            if row["model_parameters"]:
-                try:
-                    model_parameters = json.loads(row["model_parameters"])
-                except json.JSONDecodeError:
-                    model_parameters = {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                        "top_k": 40,
-                        "max_tokens": 2048,
-                    }
-
-            conversations.append(
-                Conversation(
-                    id=row["id"],
-                    title=row["title"],
-                    model=row["model"],
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                    updated_at=datetime.fromisoformat(row["updated_at"]),
-                    system_prompt=row["system_prompt"],
-                    model_parameters=model_parameters,
-                )
+        return [self._conversation_from_row(row) for row in rows]
+
+    def iter_conversations_with_messages(self) -> Iterator[Conversation]:
+        """
+        Iterate over every conversation with its messages loaded.
+
+        Uses one joined query for the whole database instead of a
+        get_conversation call per conversation. The database lock is held
+        until iteration finishes, so consume the iterator promptly.
+
+        Yields:
+            Conversations in ID order, each with its messages.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.execute(
+                """SELECT c.id, c.title, c.model, c.created_at, c.updated_at,
+                          c.system_prompt, c.model_parameters, c.message_count,
+                          c.last_message_preview,
+                          m.id, m.role, m.content, m.created_at
+                   FROM conversations c
+                   LEFT JOIN messages m ON m.conversation_id = c.id
+                   ORDER BY c.id, m.created_at, m.id"""
             )
 
-        return conversations
+            for _, group in groupby(cursor, key=itemgetter(0)):
+                rows = list(group)
+                messages = [
+                    Message(
+                        id=message_id,
+                        role=role,
+                        content=content,
+                        created_at=parse_datetime(created_at),
+                    )
+                    for message_id, role, content, created_at in (row[9:] for row in rows)
+                    if message_id is not None  # Conversation without messages
+                ]
+                yield self._conversation_from_row(rows[0][:9], messages)
 
     def rename_conversation(self, conversation_id: int, new_title: str) -> None:
         """
@@ -226,8 +376,7 @@ class ConversationManager:
             new_title: The new title for the conversation.
         """
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            conn.execute(
                 "UPDATE conversations SET title = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
                 (new_title, conversation_id),
             )
@@ -241,8 +390,7 @@ class ConversationManager:
             conversation_id: The conversation ID to delete.
         """
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            conn.execute(
                 "DELETE FROM conversations WHERE id = ?", (conversation_id,)
             )
             conn.commit()
@@ -256,8 +404,7 @@ class ConversationManager:
             system_prompt: The new system prompt (or None to clear).
         """
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            conn.execute(
                 "UPDATE conversations SET system_prompt = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
                 (system_prompt, conversation_id),
             )
@@ -274,59 +421,120 @@ class ConversationManager:
             model_parameters: Dictionary of model parameters.
         """
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            conn.execute(
                 "UPDATE conversations SET model_parameters = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                (json.dumps(model_parameters), conversation_id),
+                (json_codec.dumps(model_parameters), conversation_id),
             )
             conn.commit()
 
-    def search_messages(self, query: str, conversation_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def search_messages(
+        self, query: str, conversation_id: Optional[int] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
         """
-        Search for messages containing the query string.
+        Search for messages matching the query using the full-text index.
+
+        Every word in the query must match the start of a word in the message.
+        Results are ordered by relevance (BM25).
 
         Args:
             query: Search query string.
             conversation_id: Optional conversation ID to limit search scope.
+            limit: Maximum number of results to return.
 
         Returns:
-            List of dictionaries with message and conversation info.
+            List of dictionaries with message and conversation info, including
+            a 'snippet' of the content around the match.
         """
-        with self.db.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        match = _fts_match(query)
+        if not match:
+            return []
+
+        # FTS5 picks the best-matching window of up to 32 tokens for each hit,
+        # so callers can show a preview without scanning the full content.
+        # CROSS JOIN keeps the full-text index as the driving table: rows come
+        # out in rank order and the LIMIT stops the join early.
+        select = """SELECT m.id, m.conversation_id, c.title, m.role, m.content, m.created_at,
+                           snippet(messages_fts, 0, '', '', '...', 32)
+                    FROM messages_fts
+                    CROSS JOIN messages m ON m.id = messages_fts.rowid
+                    JOIN conversations c ON m.conversation_id = c.id
+                    WHERE messages_fts MATCH ?"""
 
+        with self.db.get_connection() as conn:
             if conversation_id:
                 # Search within a specific conversation
-                cursor.execute(
-                    """SELECT m.*, c.title as conversation_title
-                       FROM messages m
-                       JOIN conversations c ON m.conversation_id = c.id
-                       WHERE m.conversation_id = ? AND m.content LIKE ?
-                       ORDER BY m.created_at DESC""",
-                    (conversation_id, f"%{query}%"),
+                cursor = conn.execute(
+                    select + " AND m.conversation_id = ? ORDER BY messages_fts.rank LIMIT ?",
+                    (match, conversation_id, limit),
                 )
             else:
                 # Search across all conversations
-                cursor.execute(
-                    """SELECT m.*, c.title as conversation_title
-                       FROM messages m
-                       JOIN conversations c ON m.conversation_id = c.id
-                       WHERE m.content LIKE ?
-                       ORDER BY m.created_at DESC""",
-                    (f"%{query}%",),
+                cursor = conn.execute(
+                    select + " ORDER BY messages_fts.rank LIMIT ?",
+                    (match, limit),
                 )
 
             rows = cursor.fetchall()
 
         return [
             {
-                "id": row["id"],
-                "conversation_id": row["conversation_id"],
-                "conversation_title": row["conversation_title"],
-                "role": row["role"],
-                "content": row["content"],
-                "created_at": row["created_at"],
+                "id": message_id,
+                "conversation_id": conv_id,
+                "conversation_title": conversation_title,
+                "role": role,
+                "content": content,
+                "created_at": created_at,
+                "snippet": snippet,
             }
-            for row in rows
+            for message_id, conv_id, conversation_title, role, content, created_at, snippet in rows
         ]
+
+    def search_summary(
+        self, query: str, conversation_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Summarize all messages matching the query without fetching them.
+
+        Unlike search_messages, the counts are not capped by a result limit.
+
+        Args:
+            query: Search query string.
+            conversation_id: Optional conversation ID to limit search scope.
+
+        Returns:
+            Dictionary with total_results, conversations_affected and by_role,
+            in the same shape as SearchService.get_search_summary.
+        """
+        match = _fts_match(query)
+        if not match:
+            return {
+                "total_results": 0,
+                "conversations_affected": 0,
+                "by_role": {},
+            }
+
+        # One row per (conversation, role) pair; SQLite does the counting
+        sql = """WITH fts_matches AS MATERIALIZED (
+                     SELECT rowid FROM messages_fts WHERE messages_fts MATCH ?
+                 )
+                 SELECT m.conversation_id, m.role, COUNT(*)
+                 FROM fts_matches f
+                 JOIN messages m ON m.id = f.rowid"""
+        params: Tuple[Any, ...] = (match,)
+        if conversation_id:
+            sql += " WHERE m.conversation_id = ?"
+            params += (conversation_id,)
+        sql += " GROUP BY m.conversation_id, m.role"
+
+        with self.db.get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        by_role: Counter = Counter()
+        for _, role, count in rows:
+            by_role[role] += count
+
+        return {
+            "total_results": sum(by_role.values()),
+            "conversations_affected": len({conv_id for conv_id, _, _ in rows}),
+            "by_role": dict(by_role),
+        }
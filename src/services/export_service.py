@@ -1,13 +1,22 @@
 """
 Export service for conversation data.
 """
-from typing import List, Optional
+from typing import Iterable, List, Optional, TextIO
 from datetime import datetime
-import json
 from pathlib import Path
+import io
+import re
 
 from models.conversation import Conversation
 from models.message import Message
+from utils import json_codec
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_HEAVY_RULE = "=" * 60
+_LIGHT_RULE = "-" * 60
+
+# Anything other than letters, digits, space, '-' or '_' is replaced in filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w -]")
 
 
 class ExportService:
@@ -24,47 +33,46 @@ class ExportService:
         Returns:
             Markdown formatted string.
         """
-        lines = []
+        buf = io.StringIO()
+        ExportService._write_markdown(conversation, buf)
+        return buf.getvalue()
+
+    @staticmethod
+    def _write_markdown(conversation: Conversation, out: TextIO) -> None:
+        """
+        Write conversation in Markdown format to a text stream.
 
+        Args:
+            conversation: Conversation to export.
+            out: Writable text stream.
+        """
         # Header
-        lines.append(f"# {conversation.title}")
-        lines.append("")
-        lines.append(f"**Model:** {conversation.model}")
-        lines.append(f"**Created:** {conversation.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"**Updated:** {conversation.updated_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        out.write(
+            f"# {conversation.title}\n\n"
+            f"**Model:** {conversation.model}\n"
+            f"**Created:** {conversation.created_at.strftime(_TIMESTAMP_FORMAT)}\n"
+            f"**Updated:** {conversation.updated_at.strftime(_TIMESTAMP_FORMAT)}"
+        )
 
         # System prompt if present
         if conversation.system_prompt:
-            lines.append("")
-            lines.append("## System Prompt")
-            lines.append("")
-            lines.append(f"> {conversation.system_prompt}")
+            out.write(f"\n\n## System Prompt\n\n> {conversation.system_prompt}")
 
         # Model parameters
         if conversation.model_parameters:
-            lines.append("")
-            lines.append("## Model Parameters")
-            lines.append("")
+            out.write("\n\n## Model Parameters\n")
             for key, value in conversation.model_parameters.items():
-                lines.append(f"- **{key}:** {value}")
+                out.write(f"\n- **{key}:** {value}")
 
         # Messages
-        lines.append("")
-        lines.append("## Conversation")
-        lines.append("")
+        out.write("\n\n## Conversation\n")
 
         for msg in conversation.messages:
-            role_title = msg.role.capitalize()
-            timestamp = msg.created_at.strftime('%Y-%m-%d %H:%M:%S') if msg.created_at else ""
+            out.write(f"\n### {msg.role.capitalize()}")
+            if msg.created_at:
+                out.write(f"\n*{msg.created_at.strftime(_TIMESTAMP_FORMAT)}*")
+            out.write(f"\n\n{msg.content}\n")
 
-            lines.append(f"### {role_title}")
-            if timestamp:
-                lines.append(f"*{timestamp}*")
-            lines.append("")
-            lines.append(msg.content)
-            lines.append("")
-
-        return "\n".join(lines)
 
     @staticmethod
     def export_to_json(conversation: Conversation) -> str:
@@ -81,22 +89,34 @@ class ExportService:
             "id": conversation.id,
             "title": conversation.title,
             "model": conversation.model,
-            "created_at": conversation.created_at.isoformat() if conversation.created_at else None,
-            "updated_at": conversation.updated_at.isoformat() if conversation.updated_at else None,
+            "created_at": conversation.created_at,
+            "updated_at": conversation.updated_at,
             "system_prompt": conversation.system_prompt,
-            "model_parameters": conversation.model_parameters,
+            "model_parameters": dict(conversation.model_parameters),
             "messages": [
                 {
                     "id": msg.id,
                     "role": msg.role,
                     "content": msg.content,
-                    "created_at": msg.created_at.isoformat() if msg.created_at else None,
+                    "created_at": msg.created_at,
                 }
                 for msg in conversation.messages
             ],
         }
 
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        # Datetimes (or None) are encoded as ISO 8601 strings by the codec
+        return json_codec.dumps(data, indent=True)
+
+    @staticmethod
+    def _write_json(conversation: Conversation, out: TextIO) -> None:
+        """
+        Write conversation in JSON format to a text stream.
+
+        Args:
+            conversation: Conversation to export.
+            out: Writable text stream.
+        """
+        out.write(ExportService.export_to_json(conversation))
 
     @staticmethod
     def export_to_text(conversation: Conversation) -> str:
@@ -109,47 +129,50 @@ class ExportService:
         Returns:
             Plain text formatted string.
         """
-        lines = []
+        buf = io.StringIO()
+        ExportService._write_text(conversation, buf)
+        return buf.getvalue()
 
+    @staticmethod
+    def _write_text(conversation: Conversation, out: TextIO) -> None:
+        """
+        Write conversation in plain text format to a text stream.
+
+        Args:
+            conversation: Conversation to export.
+            out: Writable text stream.
+        """
         # Header
-        lines.append("=" * 60)
-        lines.append(conversation.title)
-        lines.append("=" * 60)
-        lines.append("")
-        lines.append(f"Model: {conversation.model}")
-        lines.append(f"Created: {conversation.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"Updated: {conversation.updated_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        out.write(
+            f"{_HEAVY_RULE}\n{conversation.title}\n{_HEAVY_RULE}\n\n"
+            f"Model: {conversation.model}\n"
+            f"Created: {conversation.created_at.strftime(_TIMESTAMP_FORMAT)}\n"
+            f"Updated: {conversation.updated_at.strftime(_TIMESTAMP_FORMAT)}"
+        )
 
         # System prompt if present
         if conversation.system_prompt:
-            lines.append("")
-            lines.append("System Prompt:")
-            lines.append("-" * 60)
-            lines.append(conversation.system_prompt)
-            lines.append("-" * 60)
+            out.write(
+                f"\n\nSystem Prompt:\n{_LIGHT_RULE}\n"
+                f"{conversation.system_prompt}\n{_LIGHT_RULE}"
+            )
 
         # Model parameters
         if conversation.model_parameters:
-            lines.append("")
-            lines.append("Model Parameters:")
+            out.write("\n\nModel Parameters:")
             for key, value in conversation.model_parameters.items():
-                lines.append(f"  {key}: {value}")
+                out.write(f"\n  {key}: {value}")
 
         # Messages
-        lines.append("")
-        lines.append("Conversation:")
-        lines.append("=" * 60)
+        out.write(f"\n\nConversation:\n{_HEAVY_RULE}")
 
         for msg in conversation.messages:
-            timestamp = msg.created_at.strftime('%Y-%m-%d %H:%M:%S') if msg.created_at else ""
-
-            lines.append("")
-            lines.append(f"[{msg.role.upper()}] {timestamp}")
-            lines.append("-" * 60)
-            lines.append(msg.content)
-            lines.append("-" * 60)
+            timestamp = msg.created_at.strftime(_TIMESTAMP_FORMAT) if msg.created_at else ""
+            out.write(
+                f"\n\n[{msg.role.upper()}] {timestamp}\n{_LIGHT_RULE}\n"
+                f"{msg.content}\n{_LIGHT_RULE}"
+            )
 
-        return "\n".join(lines)
 
     @staticmethod
     def save_to_file(content: str, file_path: Path) -> None:
@@ -174,7 +197,7 @@ class ExportService:
         conversation: Conversation,
         format_type: str,
         file_path: Optional[Path] = None
-    ) -> str:
+    ) -> Optional[str]:
         """
         Export conversation in the specified format.
 
@@ -184,24 +207,69 @@ class ExportService:
             file_path: Optional file path to save to. If None, returns content string.
 
         Returns:
-            Exported content as string.
+            Exported content as string, or None if it was written to file_path.
 
         Raises:
             ValueError: If format_type is invalid.
+            Exception: If file write fails.
         """
-        if format_type == "markdown":
-            content = ExportService.export_to_markdown(conversation)
-        elif format_type == "json":
-            content = ExportService.export_to_json(conversation)
-        elif format_type == "text":
-            content = ExportService.export_to_text(conversation)
-        else:
+        writers = {
+            "markdown": ExportService._write_markdown,
+            "json": ExportService._write_json,
+            "text": ExportService._write_text,
+        }
+        writer = writers.get(format_type)
+        if writer is None:
             raise ValueError(f"Invalid format type: {format_type}")
 
         if file_path:
-            ExportService.save_to_file(content, file_path)
+            # Stream straight into the file instead of building the whole export first
+            try:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    writer(conversation, f)
+            except Exception as e:
+                raise Exception(f"Failed to save file: {str(e)}")
+            return None
+
+        buf = io.StringIO()
+        writer(conversation, buf)
+        return buf.getvalue()
 
-        return content
+    @staticmethod
+    def export_all(
+        conversations: Iterable[Conversation],
+        format_type: str,
+        out_dir: Path
+    ) -> List[Path]:
+        """
+        Export many conversations, one file each, into a directory.
+
+        Pair with ConversationManager.iter_conversations_with_messages to read
+        the whole archive with a single query.
+
+        Args:
+            conversations: Conversations to export, with messages loaded.
+            format_type: Export format ('markdown', 'json', or 'text').
+            out_dir: Directory to write the files to. Created if missing.
+
+        Returns:
+            Paths of the written files.
+
+        Raises:
+            ValueError: If format_type is invalid.
+            Exception: If a file write fails.
+        """
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        paths = []
+        for conversation in conversations:
+            # Prefix with the ID so conversations with the same title don't collide
+            filename = ExportService.get_default_filename(conversation, format_type)
+            file_path = out_dir / f"{conversation.id}_{filename}"
+            ExportService.export_conversation(conversation, format_type, file_path)
+            paths.append(file_path)
+
+        return paths
 
     @staticmethod
     def get_default_filename(conversation: Conversation, format_type: str) -> str:
@@ -216,10 +284,7 @@ class ExportService:
             Default filename string.
         """
         # Sanitize title for filename
-        safe_title = "".join(
-            c if c.isalnum() or c in (' ', '-', '_') else '_'
-            for c in conversation.title
-        )
+        safe_title = _UNSAFE_FILENAME_CHARS.sub("_", conversation.title)
         safe_title = safe_title.strip()[:50]  # Limit length
 
         # Add timestamp
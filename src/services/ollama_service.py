@@ -1,9 +1,33 @@
 """
 Ollama API integration service.
 """
-from typing import List, Optional, Iterator, Dict, Any
+from typing import List, Optional, Iterator, AsyncIterator, Dict, Any, Iterable, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import asyncio
+import queue
+import threading
+import time
 import ollama
 
+# Seconds a fetched model list is reused before asking Ollama again
+MODELS_CACHE_TTL = 5.0
+
+# Seconds to wait for a model list refresh before answering from the stale cache
+MODELS_PROBE_TIMEOUT = 2.0
+
+# Seconds before a model list request is abandoned, so a stuck server can't
+# keep the probe thread (and therefore interpreter exit) waiting forever
+MODELS_FETCH_TIMEOUT = 10.0
+
+# Seconds a successful model fetch counts as proof that Ollama is reachable
+CONNECTION_CACHE_TTL = 30.0
+
+# Chunks read ahead of the consumer before the network reader waits
+STREAM_QUEUE_SIZE = 256
+
+# Marks the end of a streamed response in the chunk queue
+_STREAM_END = object()
+
 
 class OllamaService:
     """Service for interacting with Ollama API."""
@@ -11,11 +35,53 @@ class OllamaService:
     def __init__(self) -> None:
         """Initialize the Ollama service."""
         self.client = ollama.Client()
+        self.async_client = ollama.AsyncClient()
+        self._models_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        # Model list refreshes run here so a busy server can't stall callers
+        self._probe_client = ollama.Client(timeout=MODELS_FETCH_TIMEOUT)
+        self._probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ollama-probe")
+        self._probe_future: Optional[Future] = None
+        self._probe_lock = threading.Lock()
 
     def list_models(self) -> List[Dict[str, Any]]:
         """
         Get list of available Ollama models.
 
+        Results are cached for MODELS_CACHE_TTL seconds; the returned list is
+        shared between callers and must not be modified. Once the cache has
+        expired, a refresh that takes longer than MODELS_PROBE_TIMEOUT (e.g.
+        while Ollama is busy generating) returns the stale list instead.
+
+        Returns:
+            List of model information dictionaries.
+
+        Raises:
+            Exception: If unable to connect to Ollama.
+        """
+        cache = self._models_cache
+        if cache and time.monotonic() - cache[0] < MODELS_CACHE_TTL:
+            return cache[1]
+
+        with self._probe_lock:
+            # Share one in-flight refresh between concurrent callers
+            future = self._probe_future
+            if future is None or future.done():
+                future = self._probe_executor.submit(self._fetch_models)
+                self._probe_future = future
+
+        if cache is None:
+            # Nothing to fall back on yet
+            return future.result()
+
+        try:
+            return future.result(timeout=MODELS_PROBE_TIMEOUT)
+        except FutureTimeoutError:
+            return cache[1]
+
+    def _fetch_models(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the model list from Ollama and refresh the cache.
+
         Returns:
             List of model information dictionaries.
 
@@ -23,7 +89,7 @@ class OllamaService:
             Exception: If unable to connect to Ollama.
         """
         try:
-            response = self.client.list()
+            response = self._probe_client.list()
             # Response is a ListResponse object with a 'models' attribute
             models = []
             for model in response.get('models', []):
@@ -34,10 +100,15 @@ class OllamaService:
                     "modified_at": str(model.modified_at) if model.modified_at else None,
                     "digest": model.digest,
                 })
+            self._models_cache = (time.monotonic(), models)
             return models
         except Exception as e:
             raise Exception(f"Failed to fetch models: {str(e)}")
 
+    def invalidate_models_cache(self) -> None:
+        """Discard the cached model list so the next list_models call refetches it."""
+        self._models_cache = None
+
     def send_message(
         self,
         model: str,
@@ -67,22 +138,13 @@ class OllamaService:
             Exception: If the API call fails.
         """
         try:
-            # Build options dictionary for model parameters
-            options = {}
-            if temperature is not None:
-                options["temperature"] = temperature
-            if top_p is not None:
-                options["top_p"] = top_p
-            if top_k is not None:
-                options["top_k"] = top_k
-            if max_tokens is not None:
-                options["num_predict"] = max_tokens  # Ollama uses num_predict
+            options = self._build_options(temperature, top_p, top_k, max_tokens)
 
             response = self.client.chat(
                 model=model,
                 messages=messages,
                 stream=stream,
-                options=options if options else None,
+                options=options,
             )
 
             if stream:
@@ -93,32 +155,230 @@ class OllamaService:
         except Exception as e:
             raise Exception(f"Failed to send message: {str(e)}")
 
+    async def send_message_async(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        stream: bool = True,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        top_k: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str] | Dict[str, Any]:
+        """
+        Send a message to Ollama without blocking the calling event loop.
+
+        Args:
+            model: The model name to use.
+            messages: List of message dictionaries with 'role' and 'content'.
+            stream: Whether to stream the response.
+            temperature: Controls randomness (0.0-2.0). Higher = more random.
+            top_p: Nucleus sampling threshold (0.0-1.0).
+            top_k: Limits token selection to top k tokens.
+            max_tokens: Maximum tokens to generate (num_predict in Ollama).
+
+        Returns:
+            Async iterator of response chunks if streaming, else full response dict.
+
+        Raises:
+            Exception: If the API call fails.
+        """
+        try:
+            options = self._build_options(temperature, top_p, top_k, max_tokens)
+
+            response = await self.async_client.chat(
+                model=model,
+                messages=messages,
+                stream=stream,
+                options=options,
+            )
+
+            if stream:
+                return self._astream_response(response)
+            else:
+                return response
+
+        except Exception as e:
+            raise Exception(f"Failed to send message: {str(e)}")
+
+    async def send_messages_async(
+        self,
+        requests: Iterable[Tuple[str, List[Dict[str, str]]]],
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        top_k: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Send several chats to Ollama concurrently and wait for all replies.
+
+        The requests share the async client's keep-alive connection pool.
+
+        Args:
+            requests: (model, messages) pairs, one per chat.
+            temperature: Controls randomness (0.0-2.0). Higher = more random.
+            top_p: Nucleus sampling threshold (0.0-1.0).
+            top_k: Limits token selection to top k tokens.
+            max_tokens: Maximum tokens to generate (num_predict in Ollama).
+
+        Returns:
+            Full response dicts, in the same order as requests.
+
+        Raises:
+            Exception: If any of the API calls fail.
+        """
+        try:
+            options = self._build_options(temperature, top_p, top_k, max_tokens)
+
+            responses = await asyncio.gather(*(
+                self.async_client.chat(
+                    model=model,
+                    messages=messages,
+                    stream=False,
+                    options=options,
+                )
+                for model, messages in requests
+            ))
+            return list(responses)
+
+        except Exception as e:
+            raise Exception(f"Failed to send messages: {str(e)}")
+
+    @staticmethod
+    def _build_options(
+        temperature: Optional[float],
+        top_p: Optional[float],
+        top_k: Optional[int],
+        max_tokens: Optional[int],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the Ollama options dictionary for model parameters.
+
+        Args:
+            temperature: Sampling temperature.
+            top_p: Nucleus sampling threshold.
+            top_k: Top-k token limit.
+            max_tokens: Maximum tokens to generate.
+
+        Returns:
+            Options dictionary, or None if no parameters are set.
+        """
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if top_p is not None:
+            options["top_p"] = top_p
+        if top_k is not None:
+            options["top_k"] = top_k
+        if max_tokens is not None:
+            options["num_predict"] = max_tokens  # Ollama uses num_predict
+        return options if options else None
+
     def _stream_response(self, response: Iterator) -> Iterator[str]:
         """
         Process streaming response from Ollama.
 
+        Chunks are read from the network on a separate thread, so slow
+        processing of one chunk does not hold up reading the next.
+
         Args:
             response: The streaming response from Ollama.
 
         Yields:
             Response content chunks.
+
+        Raises:
+            Exception: If reading the stream fails.
+        """
+        chunks: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+        threading.Thread(
+            target=self._produce_chunks,
+            args=(response, chunks, stop),
+            daemon=True
+        ).start()
+
+        try:
+            while True:
+                item = chunks.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Let the reader thread exit if the consumer stopped early
+            stop.set()
+
+    @staticmethod
+    def _produce_chunks(response: Iterator, chunks: queue.Queue, stop: threading.Event) -> None:
         """
-        for chunk in response:
-            # Chunk is a ChatResponse object with a 'message' attribute
-            if hasattr(chunk, 'message') and chunk.message:
+        Read a streaming response into a queue until it ends or stop is set.
+
+        Args:
+            response: The streaming response from Ollama.
+            chunks: Queue receiving content chunks, then an exception or _STREAM_END.
+            stop: Event set by the consumer when it no longer wants chunks.
+        """
+        def put(item: Any) -> bool:
+            # Wait for queue space, giving up once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            for chunk in response:
+                # Chunk is a ChatResponse object; skip any without message content
+                try:
+                    content = chunk.message.content
+                except AttributeError:
+                    continue
+                if content and not put(content):  # Only queue non-empty content
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(_STREAM_END)
+
+    async def _astream_response(self, response: AsyncIterator) -> AsyncIterator[str]:
+        """
+        Process asynchronous streaming response from Ollama.
+
+        Args:
+            response: The async streaming response from Ollama.
+
+        Yields:
+            Response content chunks.
+        """
+        async for chunk in response:
+            try:
                 content = chunk.message.content
-                if content:  # Only yield non-empty content
-                    yield content
+            except AttributeError:
+                continue
+            if content:  # Only yield non-empty content
+                yield content
 
     def check_connection(self) -> bool:
         """
         Check if Ollama is running and accessible.
 
+        A model list fetched within CONNECTION_CACHE_TTL seconds counts as
+        reachable without another request.
+
         Returns:
             True if Ollama is accessible, False otherwise.
         """
+        cache = self._models_cache
+        if cache and time.monotonic() - cache[0] < CONNECTION_CACHE_TTL:
+            return True
+
         try:
-            self.list_models()
+            # Running-models endpoint is tiny, unlike the full model list
+            self.client.ps()
             return True
         except Exception:
             return False
@@ -152,3 +412,12 @@ class OllamaService:
         """
         if current_model:
             self.unload_model(current_model)
+
+    def close(self) -> None:
+        """
+        Stop background model list refreshes before the application exits.
+
+        Queued refreshes are cancelled; a running one ends within
+        MODELS_FETCH_TIMEOUT. The service must not be used afterwards.
+        """
+        self._probe_executor.shutdown(wait=False, cancel_futures=True)
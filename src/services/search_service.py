@@ -1,10 +1,28 @@
 """
 Search service for conversation messages.
 """
+import re
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from services.conversation_manager import ConversationManager
 
 
+@lru_cache(maxsize=64)
+def _compile_query(query: str, case_sensitive: bool) -> re.Pattern:
+    """
+    Compile a literal search query, reusing the pattern across result rows.
+
+    Args:
+        query: Search query string.
+        case_sensitive: Whether matching is case-sensitive.
+
+    Returns:
+        Compiled pattern matching the query text literally.
+    """
+    return re.compile(re.escape(query), 0 if case_sensitive else re.IGNORECASE)
+
+
 class SearchService:
     """Service for searching through conversation messages."""
 
@@ -37,8 +55,7 @@ class SearchService:
         if not query.strip():
             return []
 
-        # Perform case-insensitive search by default
-        # SQLite LIKE is case-insensitive by default
+        # Full-text matching ignores case and accents
         results = self.conv_manager.search_messages(query, conversation_id)
 
         # If case-sensitive search is needed, filter results
@@ -50,7 +67,13 @@ class SearchService:
 
         return results
 
-    def highlight_matches(self, text: str, query: str, max_context: int = 100) -> str:
+    def highlight_matches(
+        self,
+        text: str,
+        query: str,
+        max_context: int = 100,
+        case_sensitive: bool = False
+    ) -> str:
         """
         Create a snippet of text with highlighted search matches.
 
@@ -58,6 +81,7 @@ class SearchService:
             text: Full text content.
             query: Search query to highlight.
             max_context: Maximum characters of context around match.
+            case_sensitive: Whether to match the query case-sensitively.
 
         Returns:
             Text snippet with match highlighted.
@@ -65,18 +89,16 @@ class SearchService:
         if not query:
             return text[:max_context * 2] + ("..." if len(text) > max_context * 2 else "")
 
-        # Find first occurrence (case-insensitive)
-        lower_text = text.lower()
-        lower_query = query.lower()
-        pos = lower_text.find(lower_query)
+        # Find first occurrence without building lowercased copies of the text
+        match = _compile_query(query, case_sensitive).search(text)
 
-        if pos == -1:
+        if match is None:
             # No match found, return beginning of text
             return text[:max_context * 2] + ("..." if len(text) > max_context * 2 else "")
 
         # Calculate snippet boundaries
-        start = max(0, pos - max_context)
-        end = min(len(text), pos + len(query) + max_context)
+        start = max(0, match.start() - max_context)
+        end = min(len(text), match.end() + max_context)
 
         # Extract snippet
         snippet = text[start:end]
@@ -106,17 +128,8 @@ class SearchService:
                 "by_role": {},
             }
 
-        # Count by role
-        by_role = {}
-        for result in results:
-            role = result["role"]
-            by_role[role] = by_role.get(role, 0) + 1
-
-        # Count unique conversations
-        unique_conversations = len(set(r["conversation_id"] for r in results))
-
         return {
             "total_results": len(results),
-            "conversations_affected": unique_conversations,
-            "by_role": by_role,
+            "conversations_affected": len({r["conversation_id"] for r in results}),
+            "by_role": dict(Counter(r["role"] for r in results)),
         }
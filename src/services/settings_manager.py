@@ -1,10 +1,39 @@
 """
 Settings management service.
 """
-import json
+import atexit
+import copy
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from utils.config import SETTINGS_FILE, DEFAULT_SETTINGS, CONFIG_DIR
+from utils import json_codec
+
+# Delay before pending setting changes are written, so bursts become one write
+SAVE_DEBOUNCE_SECONDS = 0.25
+
+# Parsed settings per file, tagged with the (st_mtime_ns, st_size) they were read at
+_SETTINGS_CACHE: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+def _copy_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a settings dict so neither copy can change the other.
+
+    Only nested JSON containers (e.g. custom_theme) are deep-copied; the
+    other values are immutable and shared.
+
+    Args:
+        settings: Parsed settings.
+
+    Returns:
+        Independent copy of the settings.
+    """
+    return {
+        key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        for key, value in settings.items()
+    }
 
 
 class SettingsManager:
@@ -19,9 +48,15 @@ class SettingsManager:
         """
         self.settings_file = settings_file or SETTINGS_FILE
         self.settings: Dict[str, Any] = {}
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
         self._ensure_config_dir()
         self.load()
 
+        # Write out any change still waiting on the debounce timer
+        atexit.register(self._flush)
+
     def _ensure_config_dir(self) -> None:
         """Create config directory if it doesn't exist."""
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
@@ -30,8 +65,7 @@ class SettingsManager:
         """Load settings from file, or use defaults if file doesn't exist."""
         if self.settings_file.exists():
             try:
-                with open(self.settings_file, "r", encoding="utf-8") as f:
-                    self.settings = json.load(f)
+                self.settings = self._read_settings_file()
                 # Merge with defaults for any missing keys
                 for key, value in DEFAULT_SETTINGS.items():
                     if key not in self.settings:
@@ -43,11 +77,33 @@ class SettingsManager:
             self.settings = DEFAULT_SETTINGS.copy()
             self.save()
 
+    def _read_settings_file(self) -> Dict[str, Any]:
+        """
+        Read the settings file, reusing the last parse if it hasn't changed.
+
+        Returns:
+            Private copy of the settings stored in the file.
+        """
+        st = self.settings_file.stat()
+        cached = _SETTINGS_CACHE.get(self.settings_file)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return _copy_settings(cached[2])
+
+        settings = json_codec.loads(self.settings_file.read_bytes())
+        _SETTINGS_CACHE[self.settings_file] = (st.st_mtime_ns, st.st_size, _copy_settings(settings))
+        return settings
+
     def save(self) -> None:
         """Save current settings to file."""
+        # Write a temp file and rename it over the original so a crash
+        # mid-write never leaves a truncated settings file behind
+        tmp_file = self.settings_file.with_suffix(".json.tmp")
         try:
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, indent=2)
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(json_codec.dumps(self.settings, indent=True))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.settings_file)
         except Exception as e:
             print(f"Error saving settings: {e}")
 
@@ -66,14 +122,31 @@ class SettingsManager:
 
     def set(self, key: str, value: Any) -> None:
         """
-        Set a setting value and save.
+        Set a setting value and schedule a save.
+
+        Changes made in quick succession are written together once
+        SAVE_DEBOUNCE_SECONDS pass without another change.
 
         Args:
             key: The setting key.
             value: The value to set.
         """
-        self.settings[key] = value
-        self.save()
+        with self._flush_lock:
+            self.settings[key] = value
+            self._dirty = True
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, self._flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush(self) -> None:
+        """Save settings if there are unsaved changes."""
+        with self._flush_lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            self.save()
 
     def get_all(self) -> Dict[str, Any]:
         """
@@ -2,6 +2,8 @@
 Configuration constants for Ol-GUI.
 """
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
 # Application info
 APP_NAME = "ol-gui"
@@ -27,6 +29,14 @@ DEFAULT_SETTINGS = {
     "stream_responses": True,
 }
 
+# Default model parameters for new conversations (read-only, shared by reference)
+DEFAULT_MODEL_PARAMETERS = MappingProxyType({
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "top_k": 40,
+    "max_tokens": 2048,
+})
+
 # UI Configuration
 SIDEBAR_WIDTH = 200
 MIN_WINDOW_WIDTH = 800
@@ -127,12 +137,21 @@ THEMES = {
     },
 }
 
+# Freeze the built-in themes; get_theme_colors hands out shared references
+THEMES = MappingProxyType({
+    key: MappingProxyType(colors) for key, colors in THEMES.items()
+})
+_FALLBACK_THEME = THEMES["dark"]
+
+# Text color for the selected conversation (drawn on the theme's primary color)
+SELECTED_TEXT_COLOR = "#e0e0e0"
+
 # Color schemes (for backwards compatibility)
 DARK_MODE_COLORS = THEMES["dark"]
 LIGHT_MODE_COLORS = THEMES["light"]
 
 
-def get_theme_colors(theme_name: str):
+def get_theme_colors(theme_name: str) -> Mapping[str, str]:
     """
     Get color scheme for a theme.
 
@@ -140,6 +159,6 @@ def get_theme_colors(theme_name: str):
         theme_name: Name of the theme (dark, light, monokai, etc.)
 
     Returns:
-        Dictionary of theme colors. Returns dark theme if theme not found.
+        Read-only mapping of theme colors. Returns dark theme if theme not found.
     """
-    return THEMES.get(theme_name, THEMES["dark"])
+    return THEMES.get(theme_name, _FALLBACK_THEME)
@@ -3,15 +3,23 @@ SQLite database helper for conversation storage.
 """
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Set
 from utils.config import DATABASE_FILE
 
+# Oldest SQLite with INSERT ... RETURNING and AS MATERIALIZED CTEs
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+# Database directories already created by this process
+_DIRS_ENSURED: Set[Path] = set()
+
 
 class Database:
     """SQLite database helper for managing conversations and messages."""
 
-    CURRENT_SCHEMA_VERSION = 2  # Increment when schema changes
+    CURRENT_SCHEMA_VERSION = 7  # Increment when schema changes
 
     def __init__(self, db_path: Optional[Path] = None) -> None:
         """
@@ -19,85 +27,239 @@ class Database:
 
         Args:
             db_path: Path to the database file. Defaults to DATABASE_FILE.
+
+        Raises:
+            RuntimeError: If the SQLite library is older than MIN_SQLITE_VERSION.
         """
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            required = ".".join(map(str, MIN_SQLITE_VERSION))
+            raise RuntimeError(
+                f"SQLite {required}+ is required (Python is linked against "
+                f"SQLite {sqlite3.sqlite_version})"
+            )
+
         self.db_path = db_path or DATABASE_FILE
-        self._ensure_database_exists()
-        self._migrate_schema()
+        self._lock = threading.RLock()
+        db_dir = self.db_path.parent
+        if db_dir not in _DIRS_ENSURED:
+            db_dir.mkdir(parents=True, exist_ok=True)
+            _DIRS_ENSURED.add(db_dir)
+        self._conn = self._open_connection()
+        self._initialize_schema()
 
-    def _ensure_database_exists(self) -> None:
-        """Create database directory and initialize schema if needed."""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Open the long-lived connection shared by all queries.
+
+        Keeping one connection preserves SQLite's page cache between queries.
+
+        Returns:
+            Configured SQLite connection.
+        """
+        # A larger statement cache keeps every hot query compiled for reuse
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=512)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        # Needed for ON DELETE CASCADE to remove a deleted conversation's messages
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
 
-        with sqlite3.connect(self.db_path) as conn:
+    def _initialize_schema(self) -> None:
+        """Create and migrate the schema unless it is already current."""
+        with self.get_connection() as conn:
+            # PRAGMA user_version is stamped once the schema is fully set up,
+            # so a current database needs no DDL at all
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == self.CURRENT_SCHEMA_VERSION:
+                return
+
+            # Take the write lock up front so setup and migrations are atomic
+            conn.execute("BEGIN IMMEDIATE")
             cursor = conn.cursor()
+            self._ensure_database_exists(cursor)
+            self._migrate_schema(cursor)
+            cursor.execute(f"PRAGMA user_version = {self.CURRENT_SCHEMA_VERSION}")
 
-            # Create conversations table with new fields
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS conversations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    model TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    system_prompt TEXT,
-                    model_parameters TEXT
-                )
-            """)
+    def _ensure_database_exists(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Initialize schema if needed.
 
-            # Create messages table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS messages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    conversation_id INTEGER NOT NULL,
-                    role TEXT NOT NULL CHECK(role IN ('user', 'assistant', 'system')),
-                    content TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (conversation_id) REFERENCES conversations(id) ON DELETE CASCADE
-                )
-            """)
+        Args:
+            cursor: Database cursor.
+        """
+        # Create conversations table with new fields
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                model TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                system_prompt TEXT,
+                model_parameters TEXT,
+                message_count INTEGER NOT NULL DEFAULT 0,
+                last_message_preview TEXT
+            )
+        """)
 
-            # Create indexes
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_conversation_messages
-                ON messages(conversation_id)
-            """)
+        # Create messages table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                conversation_id INTEGER NOT NULL,
+                role TEXT NOT NULL CHECK(role IN ('user', 'assistant', 'system')),
+                content TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (conversation_id) REFERENCES conversations(id) ON DELETE CASCADE
+            )
+        """)
 
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_conversation_updated
-                ON conversations(updated_at DESC)
-            """)
+        # Create indexes. idx_messages_conv_created also serves plain
+        # conversation_id lookups such as the ON DELETE CASCADE
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_messages_conv_created
+            ON messages(conversation_id, created_at)
+        """)
 
-            # Create schema version table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS schema_version (
-                    version INTEGER PRIMARY KEY,
-                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conversation_updated
+            ON conversations(updated_at DESC)
+        """)
 
-            conn.commit()
+        # Keep per-conversation message stats current and bump the
+        # conversation timestamp whenever a message is added
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_stats_ai AFTER INSERT ON messages BEGIN
+                UPDATE conversations
+                SET message_count = message_count + 1,
+                    last_message_preview = substr(new.content, 1, 120),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = new.conversation_id;
+            END
+        """)
 
-    def _migrate_schema(self) -> None:
-        """Migrate database schema to current version."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_stats_ad AFTER DELETE ON messages BEGIN
+                UPDATE conversations
+                SET message_count = message_count - 1,
+                    last_message_preview = (
+                        SELECT substr(content, 1, 120) FROM messages
+                        WHERE conversation_id = old.conversation_id
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT 1
+                    )
+                WHERE id = old.conversation_id;
+            END
+        """)
+
+        # Create full-text index over message content
+        self._create_fts_table(cursor)
+
+        # Keep the full-text index in sync with the messages table
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+                INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+
+        # Create schema version table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
 
-            # Get current schema version
-            cursor.execute("SELECT MAX(version) FROM schema_version")
-            result = cursor.fetchone()
-            current_version = result[0] if result[0] is not None else 0
+    def _migrate_schema(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Migrate database schema to current version.
+
+        Args:
+            cursor: Database cursor.
+        """
+        # Get current schema version
+        cursor.execute("SELECT MAX(version) FROM schema_version")
+        result = cursor.fetchone()
+        current_version = result[0] if result[0] is not None else 0
 
-            # Migration from version 0 to 1: Add system_prompt and model_parameters
-            if current_version < 1:
-                self._migrate_to_v1(cursor)
-                cursor.execute("INSERT INTO schema_version (version) VALUES (1)")
+        # Migration from version 0 to 1: Add system_prompt and model_parameters
+        if current_version < 1:
+            self._migrate_to_v1(cursor)
+            cursor.execute("INSERT INTO schema_version (version) VALUES (1)")
 
-            # Migration from version 1 to 2: (Reserved for future use)
-            if current_version < 2:
-                # No changes yet, but version table is ready
-                cursor.execute("INSERT INTO schema_version (version) VALUES (2)")
+        # Migration from version 1 to 2: (Reserved for future use)
+        if current_version < 2:
+            # No changes yet, but version table is ready
+            cursor.execute("INSERT INTO schema_version (version) VALUES (2)")
 
-            conn.commit()
+        # Migration from version 2 to 3: Index existing messages for full-text search
+        if current_version < 3:
+            cursor.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+            cursor.execute("INSERT INTO schema_version (version) VALUES (3)")
+
+        # Migration from version 3 to 4: Trigger-maintained message stats
+        if current_version < 4:
+            self._migrate_to_v4(cursor)
+            cursor.execute("INSERT INTO schema_version (version) VALUES (4)")
+
+        # Migration from version 4 to 5: Fold diacritics in the full-text index
+        if current_version < 5:
+            cursor.execute("DROP TABLE IF EXISTS messages_fts")
+            self._create_fts_table(cursor)
+            cursor.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+            cursor.execute("INSERT INTO schema_version (version) VALUES (5)")
+
+        # Migration from version 5 to 6: Drop messages orphaned before
+        # foreign keys were enforced
+        if current_version < 6:
+            cursor.execute("""
+                DELETE FROM messages
+                WHERE conversation_id NOT IN (SELECT id FROM conversations)
+            """)
+            cursor.execute("INSERT INTO schema_version (version) VALUES (6)")
+
+        # Migration from version 6 to 7: Drop the index made redundant by
+        # idx_messages_conv_created
+        if current_version < 7:
+            cursor.execute("DROP INDEX IF EXISTS idx_conversation_messages")
+            cursor.execute("INSERT INTO schema_version (version) VALUES (7)")
+
+    def _create_fts_table(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Create the full-text index over message content if it doesn't exist.
+
+        The index stores no copy of the text (it reads from messages) and
+        matches case- and accent-insensitively.
+
+        Args:
+            cursor: Database cursor.
+        """
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                content,
+                content='messages',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
 
     def _migrate_to_v1(self, cursor: sqlite3.Cursor) -> None:
         """
@@ -130,11 +292,53 @@ class Database:
                 (default_params,)
             )
 
-    def get_connection(self) -> sqlite3.Connection:
+    def _migrate_to_v4(self, cursor: sqlite3.Cursor) -> None:
         """
-        Get a database connection.
+        Migrate to schema version 4: Add message_count and last_message_preview columns.
 
-        Returns:
+        Args:
+            cursor: Database cursor.
+        """
+        # Replaced by messages_stats_ai, which also bumps updated_at
+        cursor.execute("DROP TRIGGER IF EXISTS bump_conv_updated")
+
+        # Check if columns already exist
+        cursor.execute("PRAGMA table_info(conversations)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        if "message_count" not in columns:
+            cursor.execute(
+                "ALTER TABLE conversations ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0"
+            )
+
+        if "last_message_preview" not in columns:
+            cursor.execute("ALTER TABLE conversations ADD COLUMN last_message_preview TEXT")
+
+        # Backfill stats for existing conversations
+        cursor.execute("""
+            UPDATE conversations SET
+                message_count = (
+                    SELECT COUNT(*) FROM messages WHERE conversation_id = conversations.id
+                ),
+                last_message_preview = (
+                    SELECT substr(content, 1, 120) FROM messages
+                    WHERE conversation_id = conversations.id
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT 1
+                )
+        """)
+
+    @contextmanager
+    def get_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Get the shared database connection.
+
+        Access is serialized with a lock so the connection can be used from
+        background threads. The block is a transaction scope: it is committed
+        on success and rolled back on error, but the connection stays open.
+
+        Yields:
             SQLite connection object.
         """
-        return sqlite3.connect(self.db_path)
+        with self._lock, self._conn:
+            yield self._conn
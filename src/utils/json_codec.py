@@ -0,0 +1,76 @@
+"""
+JSON encoding helpers that use orjson when it is installed.
+"""
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Union
+
+try:
+    # Optional Rust-based codec, several times faster than the json module
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """
+    Serialize types the JSON encoders do not handle natively.
+
+    Read-only mappings such as MappingProxyType (used for shared defaults)
+    are encoded as objects.
+
+    Args:
+        obj: Object json could not encode.
+
+    Returns:
+        JSON-compatible representation of the object.
+
+    Raises:
+        TypeError: If the object type is not supported.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Datetimes are encoded as ISO 8601 strings and non-ASCII text is kept as-is.
+
+    Args:
+        obj: Object to serialize.
+        indent: Whether to pretty-print with two-space indentation.
+
+    Returns:
+        JSON string.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=_default, option=option).decode("utf-8")
+
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_default)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON text or UTF-8 encoded bytes.
+
+    Returns:
+        Parsed object.
+
+    Raises:
+        json.JSONDecodeError: If the document is invalid.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)